@@ -10,6 +10,23 @@ class MagFieldImpl:
         self.curves = {}
         self.curve_index = -1
         self.curve_point_index = -1
+        # built once so dispatching is a single dict lookup instead of
+        # an if-chain of string comparisons per ioctl
+        self._ioctl_handlers = {
+            "disable": lambda param_data, dry: self._disable(dry),
+            "set_field": lambda param_data, dry: self._set_field(param_data["millitesla"], dry),
+            "play_curve": lambda param_data, dry: self._play_curve(param_data["id"], dry),
+            "curve_step": lambda param_data, dry: self._curve_step(dry),
+            "curve_stop": lambda param_data, dry: self._curve_stop(dry),
+            "play_curve_stepwise": lambda param_data, dry: self._play_curve_stepwise(param_data["id"], dry),
+            "program_curve": lambda param_data, dry: self._program_curve(param_data["id"], param_data["hull"], dry),
+
+            # Ioctls not part of the official actuator interface, but used to configure
+            # the source:
+            "init_load": lambda param_data, dry: self._init_load(param_data["rref"], param_data["lref"], param_data["deltaRref"], param_data["deltaLref"]),
+            "do_load_adaption": lambda param_data, dry: self._do_load_adaption(param_data["proportial_factor"], param_data["integral_factor"], param_data["slew_rate"]),
+            "setup_dcs6k": lambda param_data, dry: self._setup_dcs6k(),
+        }
 
     def _init_load(self, rref, lref, deltaRref, deltaLRef):
         # According to RefMan 3.3.5 of the DCS6k
@@ -58,30 +75,11 @@ class MagFieldImpl:
         return self._dispatch_ioctl(ioctl, param_data, True)
 
     def _dispatch_ioctl(self, ioctl, param_data, do_dry):
+        handler = self._ioctl_handlers.get(ioctl)
+        if handler is None:
+            return {"status": "bad_ioctl", "error_message": f"The ioctl {ioctl} is undefined."}
         try:
-            if ioctl == "disable":
-                return self._disable(do_dry)
-            if ioctl == "set_field":
-                return self._set_field(param_data["millitesla"], do_dry)
-            if ioctl == "play_curve":
-                return self._play_curve(param_data["id"], do_dry)
-            if ioctl == "curve_step":
-                return self._curve_step(do_dry)
-            if ioctl == "curve_stop":
-                return self._curve_stop(do_dry)
-            if ioctl == "play_curve_stepwise":
-                return self._play_curve_stepwise(param_data["id"], do_dry)
-            if ioctl == "program_curve":
-                return self._program_curve(param_data["id"], param_data["hull"], do_dry)
-
-            # Ioctls not part of the official actuator interface, but used to configure
-            # the source:
-            if ioctl == "init_load":
-                return self._init_load(param_data["rref"], param_data["lref"], param_data["deltaRref"], param_data["deltaLref"])
-            if ioctl == "do_load_adaption":
-                return self._do_load_adaption(param_data["proportial_factor"], param_data["integral_factor"], param_data["slew_rate"])
-            if ioctl == "setup_dcs6k":
-                return self._setup_dcs6k()
+            return handler(param_data, do_dry)
         except KeyError:
             return {"status": "missing_parameter"}
         except ValueError:
@@ -94,7 +92,6 @@ class MagFieldImpl:
             # "let it crash" is probably not the correct
             # philosophy here.
             return {"status": "connection_lost"}
-        return {"status": "bad_ioctl", "error_message": f"The ioctl {ioctl} is undefined."}
 
     def _selftest(self):
         return {}
@@ -20,6 +20,9 @@ class StdfPartTestContext:
 
 
 STDF_PATH = 'temp_final_stdf_file_on_unload.stdf'
+# number of buffered part records after which the aggregator writes them out
+# in one block instead of reopening the file per record
+FLUSH_THRESHOLD = 64
 
 
 class StdfTestResultAggregator:
@@ -38,6 +41,7 @@ class StdfTestResultAggregator:
         self.end_timestamp = 0
         self.path = STDF_PATH if not file_path else file_path
         self.sites = sites
+        self._pending_records = []
 
         self._clean_up()
 
@@ -48,6 +52,7 @@ class StdfTestResultAggregator:
         os.remove(self.path)
 
     def finalize(self):
+        self.flush()
         self.end_timestamp = int(time.time())
 
     def write_to_file(self, filepath):
@@ -64,6 +69,7 @@ class StdfTestResultAggregator:
         self.write_records_to_file(self._stdf_header_records())
 
     def write_footer_records(self):
+        self.flush()
         self.write_records_to_file(self._stdf_footer_records())
 
     def _stdf_header_records(self) -> list:
@@ -98,15 +104,18 @@ class StdfTestResultAggregator:
         self.start_timestamp = int(time.time())
 
     def append_test_results(self, test_results):
-        for test_result in test_results:
-            rec = {
-                'PIR': lambda test_result: self._generate_PIR(test_result),
-                'PTR': lambda test_result: self._generate_PTR(test_result),
-                'PRR': lambda test_result: self._generate_PRR(test_result),
-                'FTR': lambda test_result: self._generate_FTR(test_result),
-            }[test_result['type']](test_result)
+        generators = self._record_generators
+        self._pending_records.extend(generators[test_result['type']](test_result) for test_result in test_results)
 
-            self.write_records_to_file([rec])
+        if len(self._pending_records) >= FLUSH_THRESHOLD:
+            self.flush()
+
+    def flush(self):
+        if not self._pending_records:
+            return
+
+        self.write_records_to_file(self._pending_records)
+        self._pending_records = []
 
     @staticmethod
     def _generate_PRR(prr_record: dict):
@@ -138,12 +147,23 @@ class StdfTestResultAggregator:
     def _generate_PIR(pir_record: dict) -> dict:
         return generate_PIR(pir_record['HEAD_NUM'], pir_record['SITE_NUM'])
 
+    _record_generators = {
+        'PIR': _generate_PIR.__func__,
+        'PTR': _generate_PTR.__func__,
+        'PRR': _generate_PRR.__func__,
+        'FTR': _generate_FTR.__func__,
+    }
+
     def append_test_summary(self, tests_summary: list):
+        # buffered part records must hit the file before any summary record,
+        # regardless of whether the caller finalized already
+        self.flush()
         for test_summary in tests_summary:
             rec = self._generate_TSR(test_summary)
             self.write_records_to_file([rec])
 
     def append_soft_and_hard_bin_record(self, bin_informations: dict):
+        self.flush()
         self.write_bin_info(bin_informations,
                             lambda head_num, site_num, bin_num, count, bin_name, bin_pf:
                                 generate_SBR(head_num, site_num, bin_num, count, bin_name, bin_pf),
@@ -175,6 +195,7 @@ class StdfTestResultAggregator:
                                              record_summary[4], record_summary[5])])
 
     def append_part_count_infos(self, part_infos: list):
+        self.flush()
         pcr_recs = []
         for part_info in part_infos:
             pcr_recs.append(generate_PCR(int(part_info['head_num']), int(part_info['site_num']),
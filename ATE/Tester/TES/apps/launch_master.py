@@ -1,6 +1,6 @@
 """ master application """
 # from common.application import Application
-from ATE.Tester.TES.apps.masterApp.master_application import MasterApplication, assert_valid_system_mimetypes_config
+from ATE.Tester.TES.apps.masterApp.master_application import MasterApplication
 from ATE.Tester.TES.apps.common import configuration_reader
 from argparse import ArgumentParser
 
@@ -29,8 +29,6 @@ def parse_config_dict_from_command_line():
 
 
 def launch_master(*, config_file_path=None, user_config_dict=None):
-    assert_valid_system_mimetypes_config()
-
     cfg = configuration_reader.ConfigReader(config_file_path)
     configuration = cfg.get_configuration_ex(user_config_dict=user_config_dict)
 
@@ -1,11 +1,13 @@
 """ master App """
 
 # External imports
+from transitions import Machine
 from transitions.core import MachineError
-from transitions.extensions import HierarchicalMachine as Machine
+from collections import deque
 from queue import Empty, Full, Queue
 import asyncio
-import mimetypes
+import concurrent.futures
+import os
 import sys
 
 from typing import Callable, List
@@ -20,51 +22,18 @@ from ATE.Tester.TES.apps.masterApp.utils.command_executor import (GetLogFileComm
 from ATE.Tester.TES.apps.masterApp.task_handler.task_handler import TaskHandler
 
 from ATE.Tester.TES.apps.common.stdf_aggregator import StdfTestResultAggregator
-from ATE.Tester.TES.apps.masterApp.resulthandling.result_collection_handler import ResultsCollector
 from ATE.Tester.TES.apps.masterApp.utils.result_Information_handler import ResultInformationHandler
 
 from ATE.Tester.TES.apps.masterApp.peripheral_controller import PeripheralController
 
-from ATE.Tester.TES.apps.masterApp.statemachines.MultiSite import (MultiSiteTestingModel, MultiSiteTestingMachine)
+from ATE.Tester.TES.apps.masterApp.statemachines.MultiSite import MultiSiteTestingModel
 from ATE.Tester.TES.apps.masterApp.execution_strategy.execution_strategy import IExecutionStrategy, get_execution_strategy
 
 INTERFACE_VERSION = 1
 MAX_NUM_OF_TEST_PROGRAM_RESULTS = 1000
-
-
-def assert_valid_system_mimetypes_config():
-    """
-    Perform sanity check for system/enfironment configuration and return
-    result as boolean.
-
-    Background info:
-
-    aiohttp uses mimetypes.guess_type() to guess the content-type to be
-    used in the http response headers when serving static files.
-
-    If we serve javascript modules with "text/plain" instead
-    of "application/javascript" the browser will not execute the file as
-    javascript module and the angular frontend does not load.
-
-    On windows mimetypes.init (called automatically by guess_type if not
-    called before) will always read content types from registry in Python
-    3.8.1 (e.g. "HKLM\\Software\\Classes\\.js\\Content Type"). The values
-    stored there may not be standard because they have been changed on
-    certain systems (reasons unknown).
-
-    Apparently it was possible to avoid this in earlier python
-    version by explicitly passing empty list to files, e.g.
-    mimetypes.init(files=[]). But this does not work anymore in 3.8.1,
-    where types from registry will always be loaded.
-    """
-    js_mime_type = mimetypes.guess_type('file.js')[0]
-    if js_mime_type != 'application/javascript':
-        print('FATAL ERROR: Invalid system configuration for .js type: '
-              + 'expected "application/javascript" but got '
-              + f'"{js_mime_type}".'
-              + ' Please fix your systems mimetypes configuration.')
-        sys.exit(1)
-
+# number of test results pushed to the websocket clients in one gather before
+# yielding back to the event loop
+WS_SEND_BATCH_SIZE = 50
 
 CONTROL_STATE_UNKNOWN = "unknown"
 CONTROL_STATE_LOADING = "loading"
@@ -84,6 +53,14 @@ TEST_TIMEOUT = 30
 RESET_TIMEOUT = 20
 RESPONSE_TIMEOUT = 10
 
+# flattened testing substates (formerly children of a 'testing' state on a
+# HierarchicalMachine, which made instantiation and state checks needlessly
+# expensive for a single substate level)
+_TESTING_STATES = ['testing_inprogress',
+                   'testing_waiting_for_resource',
+                   'testing_completed',
+                   'testing_wating_for_release']
+
 
 class MasterApplication(MultiSiteTestingModel):
 
@@ -92,7 +69,7 @@ class MasterApplication(MultiSiteTestingModel):
               'initialized',
               'loading',
               'ready',
-              {'name': 'testing', 'children': MultiSiteTestingMachine()},  # , 'remap': {'completed': 'ready'}
+              *_TESTING_STATES,
               'finished',
               'unloading',
               'error',
@@ -116,7 +93,7 @@ class MasterApplication(MultiSiteTestingModel):
         #       but this constraint may not be required here and could be done in UI)
         {'source': ['initialized', 'ready'], 'dest': '=', 'trigger': 'usersettings_command',                       'after': 'on_usersettings_command_issued'},  # noqa: E241
 
-        {'source': 'ready',              'dest': 'testing',                'trigger': 'next',                      'after': 'on_next_command_issued'},          # noqa: E241
+        {'source': 'ready',              'dest': 'testing_inprogress',     'trigger': 'next',                      'after': 'on_next_command_issued'},          # noqa: E241
         {'source': 'ready',              'dest': 'unloading',              'trigger': 'unload',                    'after': 'on_unload_command_issued'},        # noqa: E241
         {'source': 'testing_completed',  'dest': 'ready',                  'trigger': 'all_sitetests_complete',    'after': "on_allsitetestscomplete"},         # noqa: E241
         {'source': 'unloading',          'dest': 'initialized',            'trigger': 'all_siteunloads_complete',  'after': "on_allsiteunloadscomplete"},       # noqa: E241
@@ -130,41 +107,72 @@ class MasterApplication(MultiSiteTestingModel):
         {'source': '*',                  'dest': 'softerror',              'trigger': 'timeout',                   'after': 'on_timeout'},                      # noqa: E241
         {'source': '*',                  'dest': 'softerror',              'trigger': 'on_error',                  'after': 'on_error_occurred'},               # noqa: E241
         {'source': 'softerror',          'dest': 'connecting',             'trigger': 'reset',                     'after': 'on_reset_received'},               # noqa: E241
-        {'source': 'testing',            'dest': 'testing',                'trigger': 'all_site_request_testing',  'after': "on_all_sites_request_testing"},       # noqa: E241
+        {'source': _TESTING_STATES,      'dest': 'testing_inprogress',     'trigger': 'all_site_request_testing',  'after': "on_all_sites_request_testing"},    # noqa: E241
+
+        {'source': _TESTING_STATES,      'dest': 'testing_waiting_for_resource',  'trigger': 'all_sites_waiting_for_resource'},                                        # noqa: E241
+        {'source': 'testing_waiting_for_resource', 'dest': 'testing_inprogress',  'trigger': 'resource_config_applied'},                                               # noqa: E241
+        {'source': _TESTING_STATES,      'dest': 'testing_completed',      'trigger': 'all_sites_completed'},                                                       # noqa: E241
+        {'source': _TESTING_STATES,      'dest': 'testing_inprogress',     'trigger': 'all_sites_request_testing'},                                                 # noqa: E241
 
         {'source': '*',                  'dest': 'ready',                  'trigger': 'all_sitetests_complete',    'after': "on_allsitetestscomplete"},         # noqa: E241
     ]
 
+    # command name -> handler method name, built once so dispatch_command does
+    # not allocate a fresh dict of lambdas per message
+    _COMMAND_TABLE = {
+        'load': 'load_command',
+        'next': 'next',
+        'unload': 'unload',
+        'reset': 'reset',
+        'usersettings': 'usersettings_command',
+        'getresults': '_handle_command_with_response',
+        'getlogs': '_handle_command_with_response',
+        'getlogfile': '_handle_command_with_response',
+        'setloglevel': 'setloglevel',
+        'binMap': '_update_hbin_number',
+    }
+
+    # the user settings defaults are pure data, so they are derived once at
+    # class load instead of being rebuilt on every usersettings command
+    _DEFAULT_USER_SETTINGS = UserSettings.get_defaults()
+
     """ MasterApplication """
 
     def __init__(self, configuration):
         self.sites = configuration['sites']
         super().__init__(self.sites)
-        self.fsm = Machine(model=self,
-                           states=MasterApplication.states,
-                           transitions=MasterApplication.transitions,
-                           initial="startup",
-                           after_state_change='publish_state')
+        # resolved lazily by _get_loop: aiohttp's run_app may create a fresh
+        # loop after this object is constructed, so caching the policy loop
+        # here would schedule everything on a loop that never runs
+        self._loop = None
+        self.fsm = _MASTER_MACHINE
         self.configuration = configuration
         self.log = Logger('master')
         self.loglevel = LogLevel.Warning() if configuration.get('loglevel') is None else configuration['loglevel']
         self.log.set_logger_level(self.loglevel)
         self.apply_configuration(configuration)
+        # registered only after the configuration sanity checks, so a bailing
+        # constructor does not leave a model behind on the shared machine
+        self.fsm.add_model(self)
         self.init()
         self.connectionHandler = MasterConnectionHandler(self.broker_host, self.broker_port, self.configuredSites, self.device_id, self.handler_id, self)
         self.peripheral_controller = PeripheralController(self.connectionHandler.mqtt, self.device_id)
 
-        self.received_site_test_results = []
-        self.received_sites_test_results = ResultsCollector(MAX_NUM_OF_TEST_PROGRAM_RESULTS)
+        # bounded: on overflow the oldest unsent result is dropped instead of
+        # growing without limit while no client consumes them
+        self.received_site_test_results = deque(maxlen=MAX_NUM_OF_TEST_PROGRAM_RESULTS)
+        self.received_sites_test_results = deque(maxlen=MAX_NUM_OF_TEST_PROGRAM_RESULTS)
 
         self.loaded_lot_number = ""
         self.error_message = ''
 
         self.last_published_state = ''
+        self._publish_scheduled = False
         self.summary_counter = 0
         self.tsr_messages = []
 
         self.command_queue = Queue(maxsize=50)
+        self._usersettings_message_cache = (None, None)
         self._result_info_handler = ResultInformationHandler(self.sites)
 
         self.test_results = []
@@ -172,6 +180,9 @@ class MasterApplication(MultiSiteTestingModel):
         self.dummy_partid = 1
         self._first_part_tested = False
         self._stdf_aggregator = None
+        # single worker: STDF writes keep their order but never block the
+        # event loop that also serves aiohttp and MQTT
+        self._stdf_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='stdf')
         self.testing_sites = []
         self.test_num = 0
         tester = self.get_tester(configuration['tester_type'])
@@ -179,8 +190,41 @@ class MasterApplication(MultiSiteTestingModel):
         self.testing_strategy: IExecutionStrategy = self.get_execution_strategy(strategy_type, tester)
 
         self.testing_event = asyncio.Event()
+        # wakes the background task as soon as there is something to push to
+        # the websocket clients, instead of making them wait for the next tick
+        self._ws_wake = asyncio.Event()
         self.layout = None
 
+    def shutdown(self):
+        # the module-level machine keeps a strong reference to every model it
+        # was handed, so an instance is only collectable after an explicit
+        # deregistration; relying on __del__ for this can never work
+        if self in self.fsm.models:
+            self.fsm.remove_model(self)
+        # wait so pending STDF records still reach the file on teardown
+        self._stdf_executor.shutdown(wait=True)
+
+    def _submit_stdf_work(self, func, *args):
+        # the futures are fire-and-forget, so a done callback is the only
+        # place where a failed write (full disk, bad record, ...) surfaces
+        self._stdf_executor.submit(func, *args).add_done_callback(self._log_stdf_work_failure)
+
+    def _log_stdf_work_failure(self, future):
+        error = future.exception()
+        if error is not None:
+            self.log.log_message(LogLevel.Error(), f'STDF write failed: {error}')
+
+    def _get_loop(self):
+        # only a loop that is actually running is cached; before startup
+        # (e.g. the timeout armed during __init__) the policy loop is used
+        # without caching it, since run_app may replace it
+        if self._loop is None:
+            try:
+                self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                return asyncio.get_event_loop()
+        return self._loop
+
     @staticmethod
     def get_strategy_type(tester):
         return tester.get_strategy_type()
@@ -210,24 +254,28 @@ class MasterApplication(MultiSiteTestingModel):
         self.timeoutHandle = None
         self.arm_timeout(STARTUP_TIMEOUT, lambda: self.timeout("Not all sites connected."))
 
+    _REQUIRED_CONFIGURATION_KEYS = ('sites', 'device_id', 'broker_host', 'broker_port', 'enable_timeouts', 'Handler', 'environment')
+
     def apply_configuration(self, configuration: dict):
-        try:
-            self.configuredSites = configuration['sites']
-            # Sanity check for bad configurations:
-            if len(self.configuredSites) == 0:
-                self.log.log_message(LogLevel.Error(), 'Master got no sites assigned')
-                sys.exit()
-
-            self.device_id = configuration['device_id']
-            self.broker_host = configuration['broker_host']
-            self.broker_port = configuration['broker_port']
-            self.enableTimeouts = configuration['enable_timeouts']
-            self.handler_id = configuration['Handler']
-            self.env = configuration['environment']
-        except KeyError as e:
-            self.log.log_message(LogLevel.Error(), f'Master got invalid configuration: {e}')
+        missing_keys = [key for key in self._REQUIRED_CONFIGURATION_KEYS if key not in configuration]
+        if missing_keys:
+            self.log.log_message(LogLevel.Error(), f'Master got invalid configuration: missing {missing_keys}')
+            sys.exit()
+
+        self.configuredSites = tuple(configuration['sites'])
+        self._configuredSitesSet = frozenset(self.configuredSites)
+        # Sanity check for bad configurations:
+        if len(self.configuredSites) == 0:
+            self.log.log_message(LogLevel.Error(), 'Master got no sites assigned')
             sys.exit()
 
+        self.device_id = configuration['device_id']
+        self.broker_host = configuration['broker_host']
+        self.broker_port = configuration['broker_port']
+        self.enableTimeouts = configuration['enable_timeouts']
+        self.handler_id = configuration['Handler']
+        self.env = configuration['environment']
+
     @property
     def user_settings_filepath(self):
         return self.configuration.get("user_settings_filepath")
@@ -258,12 +306,12 @@ class MasterApplication(MultiSiteTestingModel):
         if self.persistent_user_settings_enabled:
             UserSettings.save_to_file(self.user_settings_filepath, self.user_settings, add_defaults=True)
 
-        self.command_queue.put_nowait(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
+        self._enqueue_command(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
 
     def _store_user_settings(self, settings):
         UserSettings.save_to_file(self.user_settings_filepath, settings, add_defaults=True)
         self.user_settings = settings
-        self.command_queue.put_nowait(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
+        self._enqueue_command(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
 
     def on_usersettings_command_issued(self, param_data: dict):
         settings = param_data['payload']
@@ -271,16 +319,15 @@ class MasterApplication(MultiSiteTestingModel):
 
     @staticmethod
     def _extract_settings(settings):
-        modified_settings = UserSettings.get_defaults()
-        for setting in settings:
-            field = {setting['name']: {'active': setting['active'], 'value': int(setting['value']) if setting.get('value') else -1}}
-            modified_settings.update(field)
+        modified_settings = dict(MasterApplication._DEFAULT_USER_SETTINGS)
+        modified_settings.update({setting['name']: {'active': setting['active'], 'value': int(setting['value']) if setting.get('value') else -1}
+                                  for setting in settings})
 
         return modified_settings
 
     @property
     def external_state(self):
-        return 'testing' if self.is_testing(allow_substates=True) else self.state
+        return 'testing' if self.state.startswith('testing_') else self.state
 
     def disarm_timeout(self):
         if self.enableTimeouts:
@@ -291,13 +338,13 @@ class MasterApplication(MultiSiteTestingModel):
     def arm_timeout(self, timeout_in_seconds: float, callback: Callable):
         if self.enableTimeouts:
             self.disarm_timeout()
-            self.timeoutHandle = asyncio.get_event_loop().call_later(timeout_in_seconds, callback)
+            self.timeoutHandle = self._get_loop().call_later(timeout_in_seconds, callback)
 
     def repost_state_if_connecting(self):
         # TODO: no reason to keep this ??
         if self.state == "connecting":
             self.publish_state()
-            asyncio.get_event_loop().call_later(1, lambda: self.repost_state_if_connecting())
+            self._get_loop().call_later(1, lambda: self.repost_state_if_connecting())
 
     def on_startup_done(self):
         self.repost_state_if_connecting()
@@ -342,11 +389,22 @@ class MasterApplication(MultiSiteTestingModel):
         self.disarm_timeout()
 
     def publish_state(self, site_id=None, param_data=None):
+        # one trigger can cascade through several states; defer the publish a
+        # loop tick so only the state the cascade settles on goes out
+        if self._publish_scheduled:
+            return
+
+        self._publish_scheduled = True
+        self._get_loop().call_soon(self._do_publish_state)
+
+    def _do_publish_state(self):
+        self._publish_scheduled = False
         if self.last_published_state == self.external_state:
             return
 
         self.last_published_state = self.external_state
-        self.log.log_message(LogLevel.Info(), f'Master state is {self.state}')
+        if self.log.info_enabled:
+            self.log.log_message(LogLevel.Info(), f'Master state is {self.state}')
         self.connectionHandler.publish_state(self.external_state)
 
     def on_loadcommand_issued(self, param_data: dict):
@@ -380,7 +438,7 @@ class MasterApplication(MultiSiteTestingModel):
         self.connectionHandler.send_load_test_to_all_sites(self.get_test_parameters(test_program_data))
         self._store_user_settings(UserSettings.get_defaults())
 
-        self.command_queue.put_nowait(GetBinTable(lambda: self._generate_bin_table_message()))
+        self._enqueue_command(GetBinTable(lambda: self._generate_bin_table_message()))
 
     def set_test_data(self, source: object):
         test_program_data = {}
@@ -410,12 +468,11 @@ class MasterApplication(MultiSiteTestingModel):
     @staticmethod
     def get_test_parameters(data):
         # TODO: workaround until we specify the connection to the server or even mount the project locally
-        from pathlib import Path
-        import os
+        program_dir = data['PROGRAM_DIR']
         return {
-            'testapp_script_path': os.path.join(os.path.basename(os.fspath(Path(data['PROGRAM_DIR'])))),
+            'testapp_script_path': os.path.basename(program_dir.rstrip('/\\')),
             'testapp_script_args': ['--verbose'],
-            'cwd': os.path.dirname(data['PROGRAM_DIR']),
+            'cwd': os.path.dirname(program_dir),
             'bin_table': data['BINTABLE']                                                           # optional/unused for now
         }
 
@@ -462,11 +519,11 @@ class MasterApplication(MultiSiteTestingModel):
 
     def on_next_command_issued(self, param_data: dict):
         if not self._first_part_tested:
-            self._stdf_aggregator.write_header_records()
+            self._submit_stdf_work(self._stdf_aggregator.write_header_records)
             self._first_part_tested = True
-            self.command_queue.put_nowait(GetLotData(lambda: self._generate_lot_data_message()))
+            self._enqueue_command(GetLotData(lambda: self._generate_lot_data_message()))
 
-        self.received_site_test_results = []
+        self.received_site_test_results.clear()
         self.arm_timeout(TEST_TIMEOUT, lambda: self.timeout("not all sites completed the active test"))
         self.pendingTransitionsTest = SequenceContainer([TEST_STATE_TESTING, TEST_STATE_IDLE], self.configuredSites, lambda: None,
                                                         lambda site, state: self.on_error(f"Bad statetransition of testapp {site} during test to {state}"))
@@ -589,6 +646,7 @@ class MasterApplication(MultiSiteTestingModel):
 
         self.received_sites_test_results.append(payload)
         self.received_site_test_results.append(param_data)
+        self._ws_wake.set()
         success, msg = self._result_info_handler.handle_result(prr_record)
 
         if not success:
@@ -597,7 +655,7 @@ class MasterApplication(MultiSiteTestingModel):
         self.test_results.append(self._result_info_handler.get_site_result_response(prr_record))
 
     def _write_stdf_data(self, stdf_data):
-        self._stdf_aggregator.append_test_results(stdf_data)
+        self._submit_stdf_work(self._stdf_aggregator.append_test_results, stdf_data)
 
     def on_control_status_changed(self, siteid: str, status_msg: dict):
         if self.external_state == 'softerror':
@@ -609,20 +667,23 @@ class MasterApplication(MultiSiteTestingModel):
             self.log.log_message(LogLevel.Error(), f'Bad interface version on site {siteid}')
             self.bad_interface_version()
 
-        try:
-            if(self.siteStates[siteid] != newstatus):
-                self.log.log_message(LogLevel.Info(), f'Control {siteid} state is {newstatus}')
-                self.siteStates[siteid] = newstatus
-                self.pendingTransitionsControl.trigger_transition(siteid, newstatus)
-        except KeyError:
+        if siteid not in self._configuredSitesSet:
             self.on_error(f"Site id received: {siteid} is not configured")
+            return
+
+        if(self.siteStates[siteid] != newstatus):
+            if self.log.info_enabled:
+                self.log.log_message(LogLevel.Info(), f'Control {siteid} state is {newstatus}')
+            self.siteStates[siteid] = newstatus
+            self.pendingTransitionsControl.trigger_transition(siteid, newstatus)
 
     def on_testapp_status_changed(self, siteid: str, status_msg: dict):
         if self.external_state == 'softerror':
             return
 
         newstatus = status_msg['payload']['state']
-        self.log.log_message(LogLevel.Info(), f'Testapp {siteid} state is {newstatus}')
+        if self.log.info_enabled:
+            self.log.log_message(LogLevel.Info(), f'Testapp {siteid} state is {newstatus}')
 
         if self.pendingTransitionsTest:
             self.pendingTransitionsTest.trigger_transition(siteid, newstatus)
@@ -631,7 +692,7 @@ class MasterApplication(MultiSiteTestingModel):
         self.log.append_log(log_msg['payload'])
 
     def on_testapp_testresult_changed(self, siteid: str, status_msg: dict):
-        if self.is_testing(allow_substates=True):
+        if self.state.startswith('testing_'):
             self.on_site_test_result_received(siteid, status_msg)
             self.handle_testresult(siteid, status_msg)
         else:
@@ -646,17 +707,25 @@ class MasterApplication(MultiSiteTestingModel):
         self.tsr_messages.extend(message['payload'])
 
         if self.summary_counter == len(self.configuredSites):
-            self._stdf_aggregator.finalize()
-
-            self._stdf_aggregator.append_soft_and_hard_bin_record(self._result_info_handler.get_hbin_soft_bin_report())
-            self._stdf_aggregator.append_test_summary(self.tsr_messages)
-            self._stdf_aggregator.append_part_count_infos(self._result_info_handler.get_part_count_infos())
-
-            self._stdf_aggregator.write_footer_records()
+            self._submit_stdf_work(self._finalize_stdf, self._stdf_aggregator,
+                                   self._result_info_handler.get_hbin_soft_bin_report(),
+                                   list(self.tsr_messages),
+                                   self._result_info_handler.get_part_count_infos())
             self._stdf_aggregator = None
             self.summary_counter = 0
             self.tsr_messages.clear()
 
+    @staticmethod
+    def _finalize_stdf(stdf_aggregator, bin_report, tsr_messages, part_count_infos):
+        stdf_aggregator.flush()
+        stdf_aggregator.finalize()
+
+        stdf_aggregator.append_soft_and_hard_bin_record(bin_report)
+        stdf_aggregator.append_test_summary(tsr_messages)
+        stdf_aggregator.append_part_count_infos(part_count_infos)
+
+        stdf_aggregator.write_footer_records()
+
     def on_testapp_resource_changed(self, siteid: str, resource_request_msg: dict):
         self.handle_resource_request(siteid, resource_request_msg)
 
@@ -687,7 +756,7 @@ class MasterApplication(MultiSiteTestingModel):
         except KeyError:
             self.log.log_message(LogLevel.Error(), f'Failed to execute response: {res}')
         except MachineError:
-            self.on_error(f'cannot trigger command "{res}" from state "{self.fsm.model.state}"')
+            self.on_error(f'cannot trigger command "{res}" from state "{self.state}"')
 
     def _handle_handler_temperature(self, param_data):
         self.log.log_message(LogLevel.Info(), f'handler temperature is : {param_data["temperature"]}')
@@ -709,7 +778,7 @@ class MasterApplication(MultiSiteTestingModel):
         except KeyError:
             self.log.log_message(LogLevel.Error(), f'Failed to execute command: {cmd}')
         except MachineError:
-            self.on_error(f'cannot trigger command "{cmd}" from state "{self.fsm.model.state}"')
+            self.on_error(f'cannot trigger command "{cmd}" from state "{self.state}"')
 
     def _send_host_link(self):
         port = self.configuration['webui_port']
@@ -749,7 +818,7 @@ class MasterApplication(MultiSiteTestingModel):
                 # as nothing is wrong with the tester per se here.
                 self.on_error(f"Failed to control resource {resource_id}. Reason: Timeout.")
 
-        asyncio.get_event_loop().create_task(periphery_io_control_task())
+        self._get_loop().create_task(periphery_io_control_task())
 
     async def periphery_io_control(self, resource_request):
         resource_id = resource_request['periphery_type']
@@ -760,18 +829,7 @@ class MasterApplication(MultiSiteTestingModel):
     def dispatch_command(self, json_data):
         cmd = json_data.get('command')
         try:
-            {
-                'load': lambda param_data: self.load_command(param_data),
-                'next': lambda param_data: self.next(param_data),
-                'unload': lambda param_data: self.unload(param_data),
-                'reset': lambda param_data: self.reset(param_data),
-                'usersettings': lambda param_data: self.usersettings_command(param_data),
-                'getresults': lambda param_data: self._handle_command_with_response(param_data),
-                'getlogs': lambda param_data: self._handle_command_with_response(param_data),
-                'getlogfile': lambda param_data: self._handle_command_with_response(param_data),
-                'setloglevel': lambda param_data: self.setloglevel(param_data),
-                'binMap': lambda param_data: self._update_hbin_number(param_data),
-            }[cmd](json_data)
+            getattr(self, self._COMMAND_TABLE[cmd])(json_data)
         except Exception as e:
             self.log.log_message(LogLevel.Error(), f'Failed to execute command {cmd}: {e}')
 
@@ -788,7 +846,15 @@ class MasterApplication(MultiSiteTestingModel):
         self.loglevel = loglevel
         self.log.set_logger_level(loglevel)
         self._send_set_log_level()
-        self.command_queue.put_nowait(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
+        self._enqueue_command(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
+
+    def _enqueue_command(self, command):
+        try:
+            self.command_queue.put_nowait(command)
+        except Full:
+            return
+
+        self._ws_wake.set()
 
     def _handle_command_with_response(self, data):
         cmd = data.get('command')
@@ -798,22 +864,18 @@ class MasterApplication(MultiSiteTestingModel):
                    'getlogfile': lambda: GetLogFileCommand(self.log, connection_id),
                    'getresults': lambda: GetTestResultsCommand(self.received_sites_test_results, connection_id),
                    }[cmd]()
-            try:
-                self.command_queue.put_nowait(obj)
-            except Full:
-                pass
-
+            self._enqueue_command(obj)
         except KeyError:
             pass
 
     def on_new_connection(self, connection_id):
-        self.command_queue.put_nowait(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
-        self.command_queue.put_nowait(GetTestResultsCommand(self.received_sites_test_results, connection_id))
-        self.command_queue.put_nowait(GetYields(lambda: self._generate_yield_message(), connection_id))
-        self.command_queue.put_nowait(GetBinTable(lambda: self._generate_bin_table_message(), connection_id))
+        self._enqueue_command(GetUserSettings(lambda: self._generate_usersettings_message(self.user_settings)))
+        self._enqueue_command(GetTestResultsCommand(self.received_sites_test_results, connection_id))
+        self._enqueue_command(GetYields(lambda: self._generate_yield_message(), connection_id))
+        self._enqueue_command(GetBinTable(lambda: self._generate_bin_table_message(), connection_id))
 
         if self._stdf_aggregator:
-            self.command_queue.put_nowait(GetLotData(lambda: self._generate_lot_data_message(), connection_id))
+            self._enqueue_command(GetLotData(lambda: self._generate_lot_data_message(), connection_id))
 
     async def _execute_commands(self, ws_comm_handler):
         while True:
@@ -835,13 +897,22 @@ class MasterApplication(MultiSiteTestingModel):
         await ws_comm_handler.send_status_to_all(self.external_state, self.error_message)
 
         # TODO: ATE-227, sync with UI Team
-        for test_result in self.received_site_test_results:
-            await ws_comm_handler.send_testresults_to_all(test_result)
+        # popleft keeps results appended during the awaits below for the next
+        # drain instead of silently dropping them with a list swap
+        queue = self.received_site_test_results
+        test_results = [queue.popleft() for _ in range(len(queue))]
+        for index in range(0, len(test_results), WS_SEND_BATCH_SIZE):
+            batch = test_results[index:index + WS_SEND_BATCH_SIZE]
+            await asyncio.gather(*(ws_comm_handler.send_testresults_to_all(test_result) for test_result in batch))
+            # give status/log pushes a chance between large bursts
+            await asyncio.sleep(0)
+
+        if test_results:
+            # yield and bin table are computed from the already accumulated
+            # results, so one push with the latest values covers the whole drain
             await ws_comm_handler.send_yields(self._generate_yield_message())
             await ws_comm_handler.send_bin_table(self._generate_bin_table_message())
 
-        self.received_site_test_results = []
-
         await self._execute_commands(ws_comm_handler)
 
         available_logs = self.log.get_current_logs()
@@ -855,18 +926,18 @@ class MasterApplication(MultiSiteTestingModel):
         return self._result_info_handler.get_bin_table()
 
     def _generate_usersettings_message(self, usersettings):
-        settings = []
-
-        for usersetting, value in usersettings.items():
-            settings.append({'name': usersetting, 'active': value['active'], 'value': int(value['value'])})
-
-        test_options = {'testoptions': settings}
-        log_level = {'loglevel': self.loglevel}
-        usersetting = {}
-        usersetting.update(test_options)
-        usersetting.update(log_level)
-
-        return usersetting
+        # the settings rarely change but the message is regenerated for every
+        # new connection; rebuild it only when the inputs differ
+        key = (self.loglevel, tuple((name, value['active'], value['value']) for name, value in usersettings.items()))
+        cached_key, cached_message = self._usersettings_message_cache
+        if key == cached_key:
+            return cached_message
+
+        settings = [{'name': name, 'active': value['active'], 'value': int(value['value'])}
+                    for name, value in usersettings.items()]
+        message = {'testoptions': settings, 'loglevel': self.loglevel}
+        self._usersettings_message_cache = (key, message)
+        return message
 
     def _generate_lot_data_message(self):
         return self._stdf_aggregator.get_MIR_dict()
@@ -883,7 +954,14 @@ class MasterApplication(MultiSiteTestingModel):
                     self.log.clear_logs()
 
                 await self._handle_sending_data(ws_comm_handler)
-                await asyncio.sleep(1)
+
+                # wake up immediately when new work arrives; the timeout keeps
+                # the periodic status push the front-end clock relies on
+                try:
+                    await asyncio.wait_for(self._ws_wake.wait(), timeout=1)
+                except asyncio.TimeoutError:
+                    pass
+                self._ws_wake.clear()
 
         except asyncio.CancelledError:
             pass
@@ -909,3 +987,33 @@ class MasterApplication(MultiSiteTestingModel):
             task_handler.run()
         except KeyboardInterrupt:
             pass
+        finally:
+            self.shutdown()
+
+
+class _CallbackCachingMachine(Machine):
+    """resolves string callbacks ('after', after_state_change, ...) once per
+    model and caches the bound method, instead of paying a getattr lookup on
+    every fired transition; the cache lives on the model so it shares the
+    model's lifetime"""
+
+    def resolve_callable(self, func, event_data):
+        if isinstance(func, str):
+            cache = event_data.model.__dict__.setdefault('_fsm_callback_cache', {})
+            try:
+                return cache[func]
+            except KeyError:
+                cache[func] = resolved = Machine.resolve_callable(func, event_data)
+                return resolved
+
+        return Machine.resolve_callable(func, event_data)
+
+
+# the states/transitions configuration is static, so the machine is built only
+# once at import time and every MasterApplication instance is just bound to it
+# as an additional model (see __init__/shutdown)
+_MASTER_MACHINE = _CallbackCachingMachine(model=None,
+                                          states=MasterApplication.states,
+                                          transitions=MasterApplication.transitions,
+                                          initial='startup',
+                                          after_state_change='publish_state')
@@ -89,19 +89,23 @@ class MasterConnectionHandler:
         self.mqtt.publish(topic, json.dumps(self._generate_state_message(state, message)))
 
     def send_reset_to_all_sites(self):
+        # serialize once, the payload is identical for both topics
+        message = json.dumps(self._generate_command_message('reset'))
+
         control_topic = f'ate/{self.device_id}/Control/cmd'
-        self.mqtt.publish(control_topic, json.dumps(self._generate_command_message('reset')))
+        self.mqtt.publish(control_topic, message)
 
         # hack: this make sure to terminate any zombie test application that do not have a parent process(control)
         testApp_topic = f'ate/{self.device_id}/TestApp/cmd'
-        self.mqtt.publish(testApp_topic, json.dumps(self._generate_command_message('reset')))
+        self.mqtt.publish(testApp_topic, message)
 
     def send_set_log_level(self, level):
         topics = [f'ate/{self.device_id}/TestApp/cmd', f'ate/{self.device_id}/Control/cmd']
         default_message = self._generate_command_message('setloglevel')
         default_message.update({'level': level})
+        message = json.dumps(default_message)
         for topic in topics:
-            self.mqtt.publish(topic, json.dumps(default_message))
+            self.mqtt.publish(topic, message)
 
     def send_set_new_hbin(self, sbin: int, hbin: int):
         testApp_topic = f'ate/{self.device_id}/TestApp/cmd'
@@ -1,6 +1,9 @@
 from ATE.common.logger import LogLevel
 from aiohttp import web, WSMsgType, WSCloseCode
+import asyncio
 import json
+import mimetypes
+import sys
 import time
 import os
 from enum import Enum
@@ -43,14 +46,21 @@ class WebsocketCommunicationHandler:
 
     async def send_message_to_all(self, data):
         self._discard_ws_connection_if_needed()
+        if not self._websockets:
+            return
+
+        # the same payload fans out to every client, serialize it only once;
+        # enqueueing never blocks, each client's sender task drains its own
+        # queue so one slow connection cannot stall the others
+        message = json.dumps(data)
         for ws in self._websockets:
-            await ws.send_json(data)
+            ws.enqueue(message)
 
     async def send_message_to_client(self, client_id, data):
         self._discard_ws_connection_if_needed()
         for ws in self._websockets:
             if ws.get_connection_id() == client_id:
-                await ws.send_json(data)
+                ws.enqueue(json.dumps(data))
 
     async def send_status_to_all(self, state, description):
         status_message = self._create_status_message(state, description)
@@ -154,6 +164,7 @@ class WebsocketCommunicationHandler:
 
     async def close_all(self):
         for ws in set(self._websockets):
+            ws.cancel_sender()
             await ws.close(code=WSCloseCode.GOING_AWAY,
                            message='Server shutdown')
 
@@ -186,7 +197,13 @@ class WebsocketCommunicationHandler:
         self._discard_ws_connection_if_needed()
 
     def _discard_ws_connection_if_needed(self):
-        self._websockets = set([ws for ws in self._websockets if ws.is_alive()])
+        alive = set()
+        for ws in self._websockets:
+            if ws.is_alive():
+                alive.add(ws)
+            else:
+                ws.cancel_sender()
+        self._websockets = alive
 
     def handle_new_connection(self, connection_id):
         self._app['master_app'].on_new_connection(connection_id)
@@ -233,7 +250,50 @@ async def webservice_cleanup(app):
         app['ws_comm_handler'] = None
 
 
+def assert_valid_system_mimetypes_config():
+    """
+    Perform sanity check for system/enfironment configuration and return
+    result as boolean.
+
+    Background info:
+
+    aiohttp uses mimetypes.guess_type() to guess the content-type to be
+    used in the http response headers when serving static files.
+
+    If we serve javascript modules with "text/plain" instead
+    of "application/javascript" the browser will not execute the file as
+    javascript module and the angular frontend does not load.
+
+    On windows mimetypes.init (called automatically by guess_type if not
+    called before) will always read content types from registry in Python
+    3.8.1 (e.g. "HKLM\\Software\\Classes\\.js\\Content Type"). The values
+    stored there may not be standard because they have been changed on
+    certain systems (reasons unknown).
+
+    Apparently it was possible to avoid this in earlier python
+    version by explicitly passing empty list to files, e.g.
+    mimetypes.init(files=[]). But this does not work anymore in 3.8.1,
+    where types from registry will always be loaded.
+
+    We register the expected type explicitly so non-standard registry
+    entries cannot break static file serving, and only fail if even that
+    does not take effect.
+    """
+    mimetypes.add_type('application/javascript', '.js')
+    js_mime_type = mimetypes.guess_type('file.js')[0]
+    if js_mime_type != 'application/javascript':
+        print('FATAL ERROR: Invalid system configuration for .js type: '
+              + 'expected "application/javascript" but got '
+              + f'"{js_mime_type}".'
+              + ' Please fix your systems mimetypes configuration.')
+        sys.exit(1)
+
+
 def webservice_setup_app(app, static_file_path):
+    # only done here, where static files are actually served; starting the
+    # master without the webservice does not need the mimetypes registry
+    assert_valid_system_mimetypes_config()
+
     if not os.path.isdir(static_file_path):
         raise ValueError(f'static_file_path is not an existing directory: {static_file_path}')
     app['static_file_path'] = static_file_path
@@ -241,10 +301,34 @@ def webservice_setup_app(app, static_file_path):
     app.on_cleanup.append(webservice_cleanup)
 
 
+# pending messages a single client may accumulate before new ones are dropped
+MAX_PENDING_CLIENT_MESSAGES = 1000
+
+
 class WebSocketConnection:
     def __init__(self, ws_connection, connection_id):
         self.ws_connection = ws_connection
         self.connection_id = connection_id
+        self._queue = asyncio.Queue(maxsize=MAX_PENDING_CLIENT_MESSAGES)
+        self._sender_task = asyncio.get_event_loop().create_task(self._sender())
+
+    async def _sender(self):
+        try:
+            while True:
+                message = await self._queue.get()
+                await self.ws_connection.send_str(message)
+        except (asyncio.CancelledError, ConnectionResetError):
+            pass
+
+    def enqueue(self, message: str):
+        try:
+            self._queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # slow client: drop the message instead of growing without bounds
+            pass
+
+    def cancel_sender(self):
+        self._sender_task.cancel()
 
     def is_alive(self):
         return not (self.ws_connection.closed or self.ws_connection.close_code is not None)
@@ -254,6 +338,3 @@ class WebSocketConnection:
 
     def get_connection_id(self):
         return self.connection_id
-
-    async def send_json(self, data):
-        await self.ws_connection.send_json(data)
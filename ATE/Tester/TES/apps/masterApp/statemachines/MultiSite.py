@@ -1,42 +1,35 @@
-from transitions.extensions import HierarchicalMachine as Machine
-
-from ATE.Tester.TES.apps.masterApp.statemachines.TestingSiteMachine import (TestingSiteModel, TestingSiteMachine)
+from ATE.Tester.TES.apps.masterApp.statemachines.TestingSiteMachine import TestingSiteModel
 
 from typing import List
 
 
-class MultiSiteTestingMachine(Machine):
-
-    def __init__(self, model=None):
-        states = ['inprogress', 'waiting_for_resource', 'completed', 'wating_for_release']
-        super().__init__(model=model, states=states, initial='inprogress')
-
-        self.add_transition('all_sites_waiting_for_resource',       '*',                                'waiting_for_resource')      # noqa: E241
-        self.add_transition('resource_config_applied',              'waiting_for_resource',                      'inprogress')                # noqa: E241
-        self.add_transition('all_sites_completed',                  '*',                                         'completed')                 # noqa: E241
-        self.add_transition('all_sites_request_testing',            '*',                                         'inprogress')                # noqa: E241
-
-
 class MultiSiteTestingModel:
     def __init__(self, site_ids: List[str], parent_model=None):
         self._site_models = {site_id: TestingSiteModel(site_id) for site_id in site_ids}
-        self._site_machines = {site_id: TestingSiteMachine(self._site_models[site_id]) for site_id in site_ids}
+        # fixed population; iterate the tuple snapshot instead of the dict view
+        self._sites_tuple = tuple(self._site_models.values())
         self._parent_model = parent_model if parent_model is not None else self
 
         self._site_test_result_received = {site_id: False for site_id in site_ids}
+        self._n_results_received = 0
         self._released_sites = []
+        self._released_set = set()
+        # incrementally tracked membership of sites in 'testing_waiting_for_resource',
+        # so the release checks do not rescan all site models per message
+        self._waiting_set = set()
 
     def handle_reset(self):
-        for site in self._site_models.values():
-            if site.is_completed():
+        for site in self._sites_tuple:
+            if site.state == 'completed':
                 site.reset()
 
         self.handle_reset_command()
 
     def handle_resource_request(self, site_id: str, resource_request: dict):
-        self._site_models[site_id].resource_requested(resource_request=resource_request)
+        self._site_models[site_id].resource_requested(resource_request)
+        self._waiting_set.add(site_id)
 
-        for site in self._site_models.values():
+        for site in self._sites_tuple:
             if site.resource_request is not None and site.resource_request != resource_request:
                 raise RuntimeError(f'mismatch in resource request from site "{site_id}": previous request of site "{site.site_id}" differs')
 
@@ -44,9 +37,10 @@ class MultiSiteTestingModel:
 
     def _on_resource_config_applied(self):
         self.resource_config_applied()
-        for site in self._site_models.values():
-            if site.is_testing_waiting_for_resource():
+        for site in self._sites_tuple:
+            if site.state == 'testing_waiting_for_resource':
                 site.resource_ready()
+        self._waiting_set.clear()
 
     def _handle_resource_release(self):
         if not self._check_for_all_remaining_sites_waiting_for_resource():
@@ -56,10 +50,14 @@ class MultiSiteTestingModel:
         self._resource_required(resource_request)
 
     def handle_testresult(self, site_id: str, testresult: dict):
-        self._site_test_result_received[site_id] = True
+        if not self._site_test_result_received[site_id]:
+            self._site_test_result_received[site_id] = True
+            self._n_results_received += 1
 
         self._site_models[site_id].testrequest_received()
+        self._waiting_set.discard(site_id)
         self._released_sites.pop(self._released_sites.index(site_id))
+        self._released_set.discard(site_id)
         self._handle_resource_release()
 
         if not self._check_for_all_sites_completed():
@@ -72,6 +70,7 @@ class MultiSiteTestingModel:
     def _reset_sites_result_received(self):
         for site_id in self._site_test_result_received:
             self._site_test_result_received[site_id] = False
+        self._n_results_received = 0
 
     def handle_status_idle(self, site_id: str):
         # TODO: do we need this
@@ -83,33 +82,34 @@ class MultiSiteTestingModel:
             if not self._site_models.get(str(site_id)):
                 continue
 
-            if self._site_models[site_id].is_testing_idle() and sites[int(site_id)]:
+            site_state = self._site_models[site_id].state
+            if site_state == 'testing_idle' and sites[int(site_id)]:
                 self._site_models[site_id].testrequest_received()
 
-            if self._site_models[site_id].is_testing_waiting_for_release() and not sites[int(site_id)]:
+            if site_state == 'testing_waiting_for_release' and not sites[int(site_id)]:
                 self._site_models[site_id].testrequest_released()
 
-            if self._site_models[site_id].is_testing_busy() and sites[int(site_id)]:
+            if site_state == 'testing_busy' and sites[int(site_id)]:
                 self._site_models[site_id].testrequest_received()
 
         self.handle_test_request(str(site_id))
 
     def handle_test_request(self, site_id: str):
-        if all(site.is_testing_waiting_for_release() for site in self._site_models.values()) and self.is_testing_inprogress():
+        if all(site.state == 'testing_waiting_for_release' for site in self._sites_tuple) and self.is_testing_inprogress():
             self.all_sites_request_testing()
             self._parent_model.all_site_request_testing()
 
     def handle_release(self, sites):
         self._released_sites = sites
+        self._released_set = set(sites)
         for site_id in sites:
             self._site_models[site_id].testrequest_released()
 
     def _check_for_all_sites_completed(self):
-        return all(is_received for _, is_received in self._site_test_result_received.items())
+        return self._n_results_received == len(self._site_models)
 
     def _check_for_all_remaining_sites_waiting_for_resource(self):
-        sites_waiting = [site_id for site_id, site in self._site_models.items() if site.is_testing_waiting_for_resource()]
-        if set(sites_waiting) != set(self._released_sites) or not len(sites_waiting):
+        if self._waiting_set != self._released_set or not self._waiting_set:
             return False
 
         return True
@@ -119,18 +119,18 @@ class MultiSiteTestingModel:
         self._parent_model.apply_resource_config(resource_request, lambda: self._on_resource_config_applied())  # Callable[[dict, Callable], None]
 
     def handle_reset_command(self):
-        for site in self._site_models.values():
+        for site in self._sites_tuple:
             site.on_unload()
 
     def handle_execution_strategy_message(self, site_id: str, execution_strategy: List[List[List[str]]]):
         self._site_models[site_id].set_execution_strategy(execution_strategy)
 
-        for site in self._site_models.values():
+        for site in self._sites_tuple:
             if site.execution_strategy is not None and site.execution_strategy != execution_strategy:
                 raise RuntimeError(f'mismatch in execution strategy configuration from site "{site_id}": "{execution_strategy}"\
                                    previous strategy configuration of site "{site.site_id}": "{site.execution_strategy}" differs')
 
-        if (all([site.execution_strategy is not None for site in self._site_models.values()])):
+        if (all([site.execution_strategy is not None for site in self._sites_tuple])):
             return True
 
         return False
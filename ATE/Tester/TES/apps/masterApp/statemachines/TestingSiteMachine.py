@@ -1,31 +1,6 @@
-from transitions.extensions import HierarchicalMachine as Machine
+from transitions.core import MachineError
 from typing import List, Optional
 
-from ATE.Tester.TES.apps.masterApp.statemachines.TestsExecutionMachine import TestsExecutionMachine
-
-
-class TestingSiteMachine(Machine):
-    states = ['inprogress',  # waiting
-              'completed',
-              'strategy_info_confirmed',
-              {'name': 'testing', 'children': TestsExecutionMachine()},
-              'error']
-
-    def __init__(self, model):
-        super().__init__(model=model, states=self.states, initial='testing', send_event=True)
-
-        self.add_transition('testrequest_received',     'testing_idle',                             'testing_waiting_for_release'),                                              # noqa: E241
-        self.add_transition('testrequest_received',     ['testing_busy', 'testing_waiting_for_resource'],             'testing_waiting_for_release'),                                              # noqa: E241
-        self.add_transition('testrequest_released',     'testing_waiting_for_release',              'testing_busy'),                                                       # noqa: E241
-
-        self.add_transition('resource_requested',       'testing_busy',                             'testing_waiting_for_resource',     before='set_requested_resource')        # noqa: E241
-        self.add_transition('resource_ready',           'testing_waiting_for_resource',             'testing_busy',                     before='clear_requested_resource')      # noqa: E241
-
-        self.add_transition('on_unload',                '*',                                        '=',                       after='clear_execution_strategy'),                             # noqa: E241
-
-        self.add_transition('on_error',                 '*',                                        'error'),                                            # noqa: E241
-        self.add_transition('reset',                    '*',                                        'inprogress',                       before=['clear_testresult', 'clear_execution_strategy']),              # noqa: E241
-
 
 class TestingSiteModel:
     site_id: str
@@ -35,24 +10,86 @@ class TestingSiteModel:
 
     def __init__(self, site_id: str):
         self.site_id = site_id
+        self.state = 'testing_idle'
         self.resource_request = None
         self.testresult = None
         self.execution_strategy = None
 
-    def set_requested_resource(self, event):
-        self.resource_request = event.kwargs['resource_request']
+    def testrequest_received(self):
+        self._trigger('testrequest_received')
+
+    def testrequest_released(self):
+        self._trigger('testrequest_released')
+
+    def resource_requested(self, resource_request: dict):
+        self._trigger('resource_requested', resource_request)
+
+    def resource_ready(self):
+        self._trigger('resource_ready')
+
+    def on_unload(self):
+        self.clear_execution_strategy()
 
-    def clear_requested_resource(self, event):
+    def on_error(self):
+        self.state = 'error'
+
+    def reset(self):
+        self.clear_testresult()
+        self.clear_execution_strategy()
+        self.state = 'inprogress'
+
+    def _trigger(self, trigger: str, *args):
+        try:
+            new_state, before = _SITE_TABLE[(self.state, trigger)]
+        except KeyError:
+            raise MachineError(f"Can't trigger event {trigger} from state {self.state}!")
+
+        if before is not None:
+            before(self, *args)
+        self.state = new_state
+
+    def is_completed(self):
+        return self.state == 'completed'
+
+    def is_testing_idle(self):
+        return self.state == 'testing_idle'
+
+    def is_testing_busy(self):
+        return self.state == 'testing_busy'
+
+    def is_testing_waiting_for_release(self):
+        return self.state == 'testing_waiting_for_release'
+
+    def is_testing_waiting_for_resource(self):
+        return self.state == 'testing_waiting_for_resource'
+
+    def set_requested_resource(self, resource_request: dict):
+        self.resource_request = resource_request
+
+    def clear_requested_resource(self):
         self.resource_request = None
 
-    def set_testresult(self, event):
-        self.testresult = event.kwargs['testresult']
+    def set_testresult(self, testresult: dict):
+        self.testresult = testresult
 
-    def clear_testresult(self, event):
+    def clear_testresult(self):
         self.testresult = None
 
     def set_execution_strategy(self, strategy: List[List[str]]):
         self.execution_strategy = strategy
 
-    def clear_execution_strategy(self, _):
+    def clear_execution_strategy(self):
         self.execution_strategy = None
+
+
+# (state, trigger) -> (new state, before callback) switch table; a single
+# tuple lookup replaces the event/condition machinery of the former
+# `transitions` based machine on the per-message hot path
+_SITE_TABLE = {
+    ('testing_idle',                 'testrequest_received'):  ('testing_waiting_for_release',  None),                                       # noqa: E241
+    ('testing_busy',                 'testrequest_received'):  ('testing_waiting_for_release',  None),                                       # noqa: E241
+    ('testing_waiting_for_resource', 'testrequest_received'):  ('testing_waiting_for_release',  None),                                       # noqa: E241
+    ('testing_waiting_for_release',  'testrequest_released'):  ('testing_busy',                 None),                                       # noqa: E241
+    ('testing_busy',                 'resource_requested'):    ('testing_waiting_for_resource', TestingSiteModel.set_requested_resource),    # noqa: E241
+    ('testing_waiting_for_resource', 'resource_ready'):        ('testing_busy',                 TestingSiteModel.clear_requested_resource),  # noqa: E241
+}
@@ -2,6 +2,7 @@ from aiohttp import web
 
 import asyncio
 import os
+import pathlib
 from enum import Enum
 
 from ATE.Tester.TES.apps.masterApp.master_connection_handler import MasterConnectionHandler
@@ -27,6 +28,12 @@ class TaskHandler:
         self.app = web.Application()
         self.app['master_app'] = self.parent
 
+        # resolved once; these are fixed for the lifetime of the handler
+        root_path_to_ui = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        self._webui_static_path = str(pathlib.Path(os.path.join(root_path_to_ui, 'ui/angular/mini-sct-gui/')))
+        self._webui_host = configuration.get('webui_host', 'localhost')
+        self._webui_port = configuration.get('webui_port', 8081)
+
     @staticmethod
     def _create_task_callback(callback: callable) -> callable:
         async def task_ctx(app):
@@ -51,15 +58,8 @@ class TaskHandler:
         return lambda app: task_ctx(app)
 
     def run(self):
-        root_path_to_ui = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
-        import pathlib
-        webui_static_path = os.path.join(root_path_to_ui, 'ui/angular/mini-sct-gui/')
-        webui_static_path = pathlib.Path(webui_static_path)
-
-        webservice_setup_app(self.app, str(webui_static_path))
+        webservice_setup_app(self.app, self._webui_static_path)
         self.app.cleanup_ctx.append(self._run_task_callback(self._connection_handler))
         self.app.cleanup_ctx.append(self._create_task_callback(lambda app: self._websocket_handler(app)))
         self.app.cleanup_ctx.append(self._create_task_callback(lambda app: self._request_handler(app)))
-        host = self._configuration.get('webui_host', 'localhost')
-        port = self._configuration.get('webui_port', 8081)
-        web.run_app(self.app, host=host, port=port)
+        web.run_app(self.app, host=self._webui_host, port=self._webui_port)
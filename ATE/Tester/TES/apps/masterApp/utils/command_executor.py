@@ -1,11 +1,10 @@
 from ATE.Tester.TES.apps.masterApp.master_webservice import WebSocketConnection, WebsocketCommunicationHandler
-import threading
+import concurrent.futures
 
-
-class NonBlockingCall(threading.Thread):
-    def __init__(self, callback):
-        super().__init__(target=callback)
-        self.start()
+# shared bounded pool; each command used to spawn (and throw away) its own
+# thread, which is both costlier and unbounded under command bursts. A single
+# worker also keeps the data acquisition in enqueueing order.
+_acquire_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='command')
 
 
 class NonBlockingCommand:
@@ -13,7 +12,7 @@ class NonBlockingCommand:
         self._is_ready = False
         self.connection_id = connection_id
         self._reply = None
-        NonBlockingCall(lambda: self.acquire_data(obj))
+        _acquire_executor.submit(self.acquire_data, obj)
 
     def acquire_data(self, obj):
         self.acquire_data_impl(obj)
@@ -49,7 +48,7 @@ class GetTestResultsCommand(NonBlockingCommand):
         await ws_comm_handler.send_testresults_to_client(self._reply, self.connection_id)
 
     def acquire_data_impl(self, data):
-        self._reply = list(data.get_data())
+        self._reply = list(data)
 
 
 class GetLogsCommand(NonBlockingCommand):
@@ -117,15 +117,17 @@ class Logger:
     def get_logger():
         return logging.getLogger()
 
+    _log_method_names = {
+        LogLevel.Info(): 'info',
+        LogLevel.Debug(): 'debug',
+        LogLevel.Warning(): 'warning',
+        LogLevel.Error(): 'error',
+        LogLevel.Measure(): 'measure',
+    }
+
     def log_message(self, type, message):
         try:
-            {
-                LogLevel.Info(): lambda: self.logger.info(message),
-                LogLevel.Debug(): lambda: self.logger.debug(message),
-                LogLevel.Warning(): lambda: self.logger.warning(message),
-                LogLevel.Error(): lambda: self.logger.error(message),
-                LogLevel.Measure(): lambda: self.logger.measure(message),
-            }[type]()
+            getattr(self.logger, self._log_method_names[type])(message)
         except Exception as e:
             raise Exception(f"message type could not be handled: {e}")
 
@@ -202,15 +204,23 @@ class Logger:
         self.stream_handler.setLevel(level)
         self.file_rotation_handler.setLevel(level)
         self.global_log_level = level
+        # cached here so hot paths can skip building messages for disabled levels
+        self.info_enabled = level <= LogLevel.Info()
+        self.debug_enabled = level <= LogLevel.Debug()
 
     @staticmethod
     def _generate_logs(logs):
+        # three str.partition calls split the 'name|asctime|levelname|message'
+        # layout without the list a split('|') would allocate per line
         structured_logs = []
+        append = structured_logs.append
         for log in logs:
-            line = log.split('|')
-            if len(line) < 3:
+            source, _, rest = log.partition('|')
+            date, _, rest = rest.partition('|')
+            type_, separator, description = rest.partition('|')
+            if not separator:
                 continue
-            structured_logs.append({'source': line[0], 'date': line[1], 'type': line[2], 'description': line[3].strip()})
+            append({'source': source, 'date': date, 'type': type_, 'description': description.rstrip()})
 
         return structured_logs
 
@@ -6,6 +6,58 @@ from uuid import uuid1
 ExecutionSequenceType = Dict[str, List[int]]
 
 
+class _ProgramIndex:
+    """lookup tables over the session's Program records, keyed by name,
+    (owner, name) and (owner, order); built lazily in one pass and dropped
+    whenever a key field changes, instead of running a linear scan with a
+    per-row lambda for every single query"""
+
+    def __init__(self):
+        self._session = None
+        self._data_cache = None
+        self._by_name = {}
+        self._by_owner_name = {}
+        self._by_owner_order = {}
+
+    def invalidate(self):
+        self._session = None
+
+    def _refresh(self, session: FileOperator):
+        # query() reloads the records if another type was queried in between,
+        # in which case session.data_cache holds new objects and the index
+        # has to be rebuilt; it also leaves the query open for the commit
+        # the callers of the getters rely on
+        session.query(Types.Program())
+        if session is self._session and session.data_cache is self._data_cache:
+            return
+
+        self._by_name = {}
+        self._by_owner_name = {}
+        self._by_owner_order = {}
+        for prog in session.query(Types.Program()).all():
+            self._by_name[prog.prog_name] = prog
+            self._by_owner_name[(prog.owner_name, prog.prog_name)] = prog
+            self._by_owner_order[(prog.owner_name, prog.prog_order)] = prog
+
+        self._session = session
+        self._data_cache = session.data_cache
+
+    def by_name(self, session: FileOperator, prog_name: str):
+        self._refresh(session)
+        return self._by_name.get(prog_name)
+
+    def by_owner_and_name(self, session: FileOperator, owner_name: str, prog_name: str):
+        self._refresh(session)
+        return self._by_owner_name.get((owner_name, prog_name))
+
+    def by_owner_and_order(self, session: FileOperator, owner_name: str, prog_order):
+        self._refresh(session)
+        return self._by_owner_order.get((owner_name, prog_order))
+
+
+_INDEX = _ProgramIndex()
+
+
 class Program:
 
     @staticmethod
@@ -22,6 +74,7 @@ class Program:
         }
         session.query(Types.Program()).add(prog)
         session.commit()
+        _INDEX.invalidate()
 
     @staticmethod
     def update(
@@ -49,21 +102,34 @@ class Program:
                .filter(lambda Program: (Program.prog_name == program_name and Program.owner_name == owner_name))\
                .delete()
         session.commit()
+        _INDEX.invalidate()
 
     @staticmethod
     def get(session: FileOperator, name: str) -> DBObject:
+        prog = _INDEX.by_name(session, name)
+        if prog is not None:
+            return prog
+
         return session.query(Types.Program())\
                       .filter(lambda Program: Program.prog_name == name)\
                       .one()
 
     @staticmethod
     def get_by_name_and_owner(session: FileOperator, prog_name: str, owner_name: str) -> DBObject:
+        prog = _INDEX.by_owner_and_name(session, owner_name, prog_name)
+        if prog is not None:
+            return prog
+
         return session.query(Types.Program())\
                       .filter(lambda Program: (Program.prog_name == prog_name and Program.owner_name == owner_name))\
                       .one()
 
     @staticmethod
     def get_by_order_and_owner(session: FileOperator, prog_order: str, owner_name: str) -> DBObject:
+        prog = _INDEX.by_owner_and_order(session, owner_name, prog_order)
+        if prog is not None:
+            return prog
+
         return session.query(Types.Program())\
                       .filter(lambda Program: (Program.prog_order == prog_order and Program.owner_name == owner_name))\
                       .one()
@@ -73,6 +139,7 @@ class Program:
         prog = Program.get(session, prog_name)
         prog.prog_name = new_name
         session.commit()
+        _INDEX.invalidate()
 
     @staticmethod
     def _update_program_order_neighbour(session: FileOperator, owner_name: str, prev_order: int, order: int, new_name: str, id: int):
@@ -82,6 +149,7 @@ class Program:
         prog.prog_order = order
         prog.prog_name = new_name
         session.commit()
+        _INDEX.invalidate()
 
     @staticmethod
     def _update_program_order(session: FileOperator, owner_name: str, prev_order: int, order: int, new_name: str):
@@ -91,6 +159,7 @@ class Program:
         prog.prog_name = new_name
         prog.prog_order = order
         session.commit()
+        _INDEX.invalidate()
 
     def update_program_order(session: FileOperator, program_name: str, owner_name: str, order: int):
         program = session.query(Types.Program())\
@@ -98,6 +167,22 @@ class Program:
                          .one()
         program.prog_order = order
         session.commit()
+        _INDEX.invalidate()
+
+    @staticmethod
+    def reorder(session: FileOperator, owner_name: str, moves: List[tuple]):
+        """apply several (id, new_order, new_name) moves for one owner with a
+        single record scan and a single commit"""
+        programs = {prog.id: prog for prog in session.query(Types.Program())
+                                                     .filter(lambda Program: Program.owner_name == owner_name)
+                                                     .all()}
+        for prog_id, new_order, new_name in moves:
+            prog = programs[prog_id]
+            prog.prog_order = new_order
+            prog.prog_name = new_name
+
+        session.commit()
+        _INDEX.invalidate()
 
     @staticmethod
     def get_programs_for_owner(session: FileOperator, owner_name: str) -> list:
@@ -128,6 +213,7 @@ class Program:
         prog = Program.get_by_order_and_owner(session, current_order, owner_name)
         prog.prog_order = new_order
         session.commit()
+        _INDEX.invalidate()
 
     @staticmethod
     def get_programs_for_target(session: FileOperator, target_name: str) -> list:
@@ -7,9 +7,19 @@ from ATE.spyder.widgets.actions_on.utils.ExceptionHandler import (handle_excpeti
 from ATE.spyder.widgets.constants import SUBFLOWS_QUALIFICATION, FLOWS
 
 from PyQt5 import QtGui, QtCore
+import functools
+import importlib
 import os
 
 
+@functools.lru_cache(maxsize=None)
+def _load_impl_module(implmodule):
+    # the same implementation modules are resolved for every flow item in the
+    # tree; cache them so repeat item construction is a dict lookup instead of
+    # an import machinery walk
+    return importlib.import_module(implmodule)
+
+
 def generate_item_name(item):
     # construct a unique name for this item. Since SimpleItems
     # exist in multiple versions with the same basic name, we construct
@@ -115,8 +125,7 @@ class SimpleFlowItem(FlowItem):
 class QualiFlowItemBase(FlowItem):
     def __init__(self, project_info, name, implmodule, parent=None):
         super().__init__(project_info, name, parent)
-        import importlib
-        self.mod = importlib.import_module(implmodule)
+        self.mod = _load_impl_module(implmodule)
         self.setToolTip(getattr(self.mod, "quali_flow_tooltip"))
         self.setText(getattr(self.mod, "quali_flow_listentry_name"))
         self.flowname = (getattr(self.mod, "quali_flow_name"))
@@ -182,8 +191,7 @@ class MultiInstanceQualiFlowItem(QualiFlowItemBase):
 class QualiFlowSubitemInstance(BaseItem):
     def __init__(self, project_info, subflow, product, data, implmodule, parent):
         super().__init__(project_info, subflow.name, parent)
-        import importlib
-        self.mod = importlib.import_module(implmodule)
+        self.mod = _load_impl_module(implmodule)
         self.product = product
         self.data = subflow
         self._generate_sub_items()
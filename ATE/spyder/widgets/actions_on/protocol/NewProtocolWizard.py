@@ -12,17 +12,22 @@ from PyQt5 import QtWidgets
 from PyQt5 import uic
 
 
-class NewProtocolWizard(QtWidgets.QDialog):
+my_ui = __file__.replace('.py', '.ui')
+if not os.path.exists(my_ui):
+    raise Exception("can not find %s" % my_ui)
+# compile the .ui XML once at import time instead of on every dialog creation
+_UI_CLASS, _ = uic.loadUiType(my_ui)
+_WINDOW_TITLE = ' '.join(re.findall('.[^A-Z]*', os.path.basename(__file__).replace('.py', '')))
+
+
+class NewProtocolWizard(QtWidgets.QDialog, _UI_CLASS):
 
     def __init__(self, parent):
         super(NewProtocolWizard, self).__init__()
 
-        my_ui = __file__.replace('.py', '.ui')
-        if not os.path.exists(my_ui):
-            raise Exception("can not find %s" % my_ui)
-        uic.loadUi(my_ui, self)
+        self.setupUi(self)
         self.setWindowFlags(QtCore.Qt.WindowStaysOnTopHint)
-        self.setWindowTitle(' '.join(re.findall('.[^A-Z]*', os.path.basename(__file__).replace('.py', ''))))
+        self.setWindowTitle(_WINDOW_TITLE)
 
         # TODO: fix this
         # self.parent = parent
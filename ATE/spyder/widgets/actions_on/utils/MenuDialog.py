@@ -23,12 +23,7 @@ class MenuDialog(BaseDialog):
         ui_file = os.path.join(os.path.dirname(__file__), ui_name)
         super().__init__(ui_file, parent)
         self.action = action
-        for _ in self._steps():
-            pass
-
-    def _steps(self):
         self._setup()
-        yield
         self._connect_action_handler()
 
     def show(self):
@@ -111,11 +106,13 @@ class NewGroupDialog(MenuDialog):
         self.fileName.setFocus(QtCore.Qt.MouseFocusReason)
         self.project_info = project_info
         self.groups = project_info.get_groups()
+        # validate runs on every keystroke, collect the names once
+        self._group_names = frozenset(group.name for group in self.groups)
         self.group_parent = group_parent
         self.group_name = None
 
     def validate(self, text):
-        if not text or text in [group.name for group in self.groups]:
+        if not text or text in self._group_names:
             self.feedback.setText("name is not valid or already used")
             self.feedback.setStyleSheet("color: orange")
             self.ok_button.setDisabled(True)
@@ -892,17 +892,13 @@ class ProjectNavigation(QObject):
         return Program.get_by_order_and_owner(self.get_file_operator(), prog_order, owner_name).prog_name
 
     def _update_elements(self, prog_name, owner_name, prev_order, order, id):
-        neighbour = self._get_test_program_name(order, owner_name)
+        neighbour_prog = Program.get_by_order_and_owner(self.get_file_operator(), order, owner_name)
+        neighbour = neighbour_prog.prog_name
         self._update_sequence(prog_name, neighbour, owner_name)
 
-        self._update_program_order(owner_name, prev_order, order, neighbour)
-        self._update_program_order_neighbour(owner_name, order, prev_order, prog_name, id)
-
-    def _update_program_order_neighbour(self, owner_name, prev_order, order, new_name, id):
-        Program._update_program_order_neighbour(self.get_file_operator(), owner_name, prev_order, order, new_name, id)
-
-    def _update_program_order(self, owner_name, prev_order, order, new_name):
-        Program._update_program_order(self.get_file_operator(), owner_name, prev_order, order, new_name)
+        # one scan and one commit for the whole swap instead of two of each
+        Program.reorder(self.get_file_operator(), owner_name,
+                        [(id, order, neighbour), (neighbour_prog.id, prev_order, prog_name)])
 
     def get_program_owner_element_count(self, owner_name):
         return Program.get_program_owner_element_count(self.get_file_operator(), owner_name)
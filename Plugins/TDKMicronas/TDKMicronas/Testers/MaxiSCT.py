@@ -1,20 +1,10 @@
-
-from TDKMicronas.Testers.InterfaceSCT import InterfaceSCT
-
-
-class MaxiSCT(InterfaceSCT):
-    def get_sites_count(self):
-        # TODO: temporary value for 16
-        return 16
-
-    def do_request(self, site_id: int, timeout: int) -> bool:
-        return True
-
-    def test_in_progress(self, site_id: int):
-        pass
-
-    def test_done(self, site_id: int, timeout: int):
-        pass
-
-    def do_init_state(self, site_id: int):
-        pass
+
+from TDKMicronas.Testers.InterfaceSCT import InterfaceSCT, SCTDefaultsMixin
+
+
+class MaxiSCT(SCTDefaultsMixin, InterfaceSCT):
+    __slots__ = ()
+
+    def get_sites_count(self):
+        # TODO: temporary value for 16
+        return 16
@@ -1,23 +1,17 @@
 
-from TDKMicronas.Testers.InterfaceSCT import InterfaceSCT
+import logging
 
+from TDKMicronas.Testers.InterfaceSCT import InterfaceSCT, SCTDefaultsMixin
+
+_LOG = logging.getLogger(__name__)
+
+
+class MiniSCT(SCTDefaultsMixin, InterfaceSCT):
+    __slots__ = ()
 
-class MiniSCT(InterfaceSCT):
     def pulse_trigger_out(self, pulse_width_ms):
         # ToDo: Implement with actual hardware.
-        print(f"MiniSCT: Pulse Trigger Out")
+        _LOG.debug("MiniSCT: Pulse Trigger Out")
 
     def get_sites_count(self):
         return 1
-
-    def do_request(self, site_id: int, timeout: int) -> bool:
-        return True
-
-    def test_in_progress(self, site_id: int):
-        pass
-
-    def test_done(self, site_id: int, timeout: int):
-        pass
-
-    def do_init_state(self, site_id: int):
-        pass
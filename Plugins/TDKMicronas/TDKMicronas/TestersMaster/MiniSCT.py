@@ -1,12 +1,15 @@
 import asyncio
+import logging
 
 from TDKMicronas.TestersMaster.InterfaceSCT import InterfaceSCT
 
+_LOG = logging.getLogger(__name__)
+
 
 class MiniSCT(InterfaceSCT):
     def pulse_trigger_out(self, pulse_width_ms):
         # ToDo: Implement with actual hardware.
-        print(f"MiniSCT: Pulse Trigger Out")
+        _LOG.debug("MiniSCT: Pulse Trigger Out")
 
     def get_sites_count(self):
         return 1
@@ -1,9 +1,13 @@
+import logging
+
 from ATE.common.logger import Logger
 from ATE.semiateplugins.hookspec import hookimpl
 from TDKMicronas.Testers import MiniSCT, MaxiSCT
 from TDKMicronas.TestersMaster import MiniSCT as MasterMiniSCT, MaxiSCT as MasterMaxiSCT
 from TDKMicronas.Flatcache import Flatcache
 
+_LOG = logging.getLogger(__name__)
+
 
 class BusinessObjectStandin:
     def __init__(self, logger: Logger = None):
@@ -25,7 +29,7 @@ class BusinessObjectStandin:
         pass
 
     def apply_configuration(self, data):
-        print("Configuration applied.")
+        _LOG.debug("Configuration applied.")
 
 
 class Plugin:
@@ -136,7 +140,7 @@ class Plugin:
 
     @hookimpl
     def get_general_purpose_function(func_name: str, logger: Logger):
-        print(f"Get General Purpose Function: {func_name}")
+        _LOG.debug("Get General Purpose Function: %s", func_name)
         if func_name == "TDKMicronas.Flatcache":
             return Flatcache.Flatcache()
 
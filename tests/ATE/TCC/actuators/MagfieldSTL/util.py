@@ -1,41 +1,40 @@
+from collections import deque
+
 from ATE.TCC.Actuators.MagfieldSTL.communication.CommunicationChannel import CommunicationChannel
 
 
 class DummyCommChan(CommunicationChannel):
 
     def __init__(self):
-        self.sent_data = []
-        self.received_data = []
+        # expectations are consumed in the order they were queued
+        self.sent_data = deque()
+        self.received_data = deque()
 
     def send(self, data):
         # This will throw, if data was sent, if no data was expected
         next_sent_item = None
         try:
-            next_sent_item = self.sent_data.pop(0)
+            next_sent_item = self.sent_data.popleft()
         except IndexError:
             print(f"Trying to send {data} when nothing was expected.")
             assert(False)
 
-        sent_data_string = data.decode("utf-8")
         # This will throw if data was sent, that does not match expected data.
-        if next_sent_item != sent_data_string:
+        if next_sent_item != data:
             print(f"Expected: {next_sent_item}")
-            print(f"Seen: {sent_data_string}")
+            print(f"Seen: {data}")
             assert(False)
 
     def receive(self, timeout):
-        return self.received_data.pop()
+        return self.received_data.popleft()
 
     def expect_send_with_reply(self, data_to_send, reply):
         self.received_data.append(reply.encode('utf-8'))
-        actual_data = f"{data_to_send}\r\n"
-        self.sent_data.append(actual_data)
+        # encoded once here so send compares bytes to bytes
+        self.sent_data.append(f"{data_to_send}\r\n".encode('utf-8'))
 
     def check_send_expectations(self):
-        fail = False
-        for sends in self.sent_data:
-            fail = True
-        assert(not fail)
+        assert not self.sent_data, f"unmet sends: {list(self.sent_data)}"
 
     def is_connected(self):
         return True
@@ -52,7 +52,9 @@ def default_configuration():
 def master_app():
     with mock.patch('ATE.Tester.TES.apps.masterApp.master_application.MasterApplication.get_tester', return_value=Tester()):
         cfg = default_configuration()
-        yield master_application.MasterApplication(cfg)
+        app = master_application.MasterApplication(cfg)
+        yield app
+        app.shutdown()
 
 
 class TestApplication:
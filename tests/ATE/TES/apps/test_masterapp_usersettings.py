@@ -52,6 +52,8 @@ class TestApplication:
         UserSettings.save_to_file.assert_not_called()
         UserSettings.load_from_file.assert_not_called()
 
+        app.shutdown()
+
     def test_masterapp_usersettings_persistent_config_default_initialized_if_file_not_exists(self, mocker):
         mocker.patch.object(UserSettings, 'save_to_file')
         mocker.patch.object(UserSettings, 'load_from_file')
@@ -69,6 +71,8 @@ class TestApplication:
         UserSettings.load_from_file.assert_called_once_with(DEFAULT_USER_SETTINGS_FILE_UNITTEST)
         UserSettings.save_to_file.assert_called_once_with(DEFAULT_USER_SETTINGS_FILE_UNITTEST, self.default_UserSettings(), add_defaults=mocker.ANY)
 
+        app.shutdown()
+
     def test_masterapp_usersettings_persistent_config_initialized_from_existing_file(self, mocker):
         mocker.patch.object(UserSettings, 'save_to_file')
         mocker.patch.object(master_application.MasterApplication, 'get_tester')
@@ -89,6 +93,8 @@ class TestApplication:
         UserSettings.load_from_file.assert_called_once_with(DEFAULT_USER_SETTINGS_FILE_UNITTEST)
         UserSettings.save_to_file.assert_called_once_with(DEFAULT_USER_SETTINGS_FILE_UNITTEST, custom_usersettings, add_defaults=True)
 
+        app.shutdown()
+
     def test_masterapp_usersettings_saved_on_modify(self, mocker):
         mocker.patch.object(UserSettings, 'save_to_file')  # mock to avoid file creation
         mocker.patch.object(UserSettings, 'load_from_file')
@@ -110,3 +116,5 @@ class TestApplication:
             assert app.user_settings[expected_usersetting] == expected_usersettings[expected_usersetting]
 
         UserSettings.save_to_file.assert_called_once_with(DEFAULT_USER_SETTINGS_FILE_UNITTEST, expected_usersettings, add_defaults=True)
+
+        app.shutdown()
@@ -24,3 +24,4 @@ class TestWebsocketCommunicationHandler:
         data = "{\"type\" : \"cmd\", \"command\" : \"load\" }"
         self.webservice.handle_client_message(data)
         MasterApplication.dispatch_command.assert_called_once()
+        self.masterApp.shutdown()
@@ -19,7 +19,58 @@ def program():
     return Program()
 
 
+def add_program(fsoperator, program: Program, name: str, owner: str, order: int):
+    program.add(fsoperator, name, "hw0", "PR", "some target", "A", "B", "ASIC", owner, order, "cache", "cachepolicy", "101", 0, {})
+
+
 def test_can_create_program(fsoperator, program: Program):
     program.add(fsoperator, "foo", "hw0", "PR", "some target", "A", "B", "ASIC", "Evil Monkey", 1, "cache", "cachepolicy", "101", 0, {})
     pkg = program.get(fsoperator, "foo")
     assert(pkg.base == "PR")
+
+
+def test_repeated_lookup_is_served_from_the_index(fsoperator, program: Program):
+    add_program(fsoperator, program, "prog1", "owner", 0)
+    first = program.get(fsoperator, "prog1")
+    # the second get hits the index built by the first and returns the
+    # very same record object
+    assert(program.get(fsoperator, "prog1") is first)
+    assert(program.get_by_name_and_owner(fsoperator, "prog1", "owner") is first)
+    assert(program.get_by_order_and_owner(fsoperator, 0, "owner") is first)
+
+
+def test_index_sees_programs_added_and_removed_after_build(fsoperator, program: Program):
+    add_program(fsoperator, program, "prog1", "owner", 0)
+    program.get(fsoperator, "prog1")
+    add_program(fsoperator, program, "prog2", "owner", 1)
+    assert(program.get_by_name_and_owner(fsoperator, "prog2", "owner").prog_order == 1)
+    program.remove(fsoperator, "prog2", "owner")
+    assert(program.get_program_owner_element_count(fsoperator, "owner") == 1)
+
+
+def test_rename_invalidates_the_index(fsoperator, program: Program):
+    add_program(fsoperator, program, "prog1", "owner", 0)
+    program.get(fsoperator, "prog1")
+    program.update_program_name(fsoperator, "prog1", "prog2")
+    assert(program.get(fsoperator, "prog2").prog_name == "prog2")
+    assert(program.get_by_name_and_owner(fsoperator, "prog2", "owner").prog_order == 0)
+
+
+def test_lookup_falls_back_to_scan_on_index_miss(fsoperator, program: Program):
+    add_program(fsoperator, program, "prog1", "owner", 0)
+    program.get(fsoperator, "prog1")
+    # a record added behind the Program API's back is unknown to the index,
+    # but the getters still find it through the linear fallback
+    fsoperator.query("program").add({"id": "raw", "prog_name": "prog2", "owner_name": "owner", "prog_order": 1})
+    fsoperator.commit()
+    assert(program.get(fsoperator, "prog2").id == "raw")
+
+
+def test_reorder_swaps_programs_with_a_single_commit(fsoperator, program: Program):
+    add_program(fsoperator, program, "prog1", "owner", 0)
+    add_program(fsoperator, program, "prog2", "owner", 1)
+    first = program.get_by_name_and_owner(fsoperator, "prog1", "owner")
+    second = program.get_by_name_and_owner(fsoperator, "prog2", "owner")
+    program.reorder(fsoperator, "owner", [(first.id, 1, "prog1"), (second.id, 0, "prog2")])
+    assert(program.get_by_order_and_owner(fsoperator, 0, "owner").prog_name == "prog2")
+    assert(program.get_by_order_and_owner(fsoperator, 1, "owner").prog_name == "prog1")